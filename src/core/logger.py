@@ -147,6 +147,31 @@ class SerialLogger:
             conn.commit()
             conn.close()
     
+    def log_data_bulk(self, rows: List[tuple]):
+        """
+        Log many rows in a single transaction
+        Each row: (timestamp, port, direction, data, display_mode, session_id)
+        """
+        if not rows:
+            return
+        
+        params = [
+            (timestamp.isoformat(), port, direction.value, data, display_mode, session_id)
+            for timestamp, port, direction, data, display_mode, session_id in rows
+        ]
+        
+        with self.lock:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO logs (timestamp, port, direction, data, display_mode, session_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', params)
+            
+            conn.commit()
+            conn.close()
+    
     def get_logs(self, port: Optional[str] = None, session_id: Optional[int] = None,
                  start_time: Optional[str] = None, end_time: Optional[str] = None,
                  limit: int = 1000) -> List[Dict[str, Any]]:
@@ -7,8 +7,9 @@ Hỗ trợ:
 - Custom Python scripts
 """
 from typing import Dict, Any, Optional, Callable, List
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer, Qt
 from datetime import datetime
+from functools import partial
 import re
 import time
 
@@ -190,6 +191,9 @@ class ScriptEngine(QObject):
     script_error = pyqtSignal(str)   # Error từ script
     rule_matched = pyqtSignal(str)   # Auto-response rule matched
     
+    # Yêu cầu check auto-response, xử lý sau qua event loop
+    _auto_response_requested = pyqtSignal(bytes, object)  # data, serial_connection
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -197,6 +201,9 @@ class ScriptEngine(QObject):
         self.scheduled_tasks: List[ScheduledTask] = []
         self.current_recording: Optional[RecordSession] = None
         self.saved_recordings: Dict[str, RecordSession] = {}
+        
+        self._auto_response_requested.connect(self.check_auto_response,
+                                              Qt.ConnectionType.QueuedConnection)
     
     def execute_script(self, script_code: str, context: ScriptContext):
         """
@@ -231,6 +238,14 @@ class ScriptEngine(QObject):
         """Xóa auto-response rule"""
         self.auto_response_rules = [r for r in self.auto_response_rules if r.name != rule_name]
     
+    def queue_auto_response(self, data: bytes, serial_connection):
+        """
+        Đưa việc check auto-response vào event loop
+        Không làm gì nếu chưa có rule nào
+        """
+        if self.auto_response_rules:
+            self._auto_response_requested.emit(data, serial_connection)
+    
     def check_auto_response(self, data: bytes, serial_connection) -> bool:
         """
         Kiểm tra data với auto-response rules
@@ -248,7 +263,7 @@ class ScriptEngine(QObject):
                 # Gửi response (với delay nếu cần)
                 if rule.delay_ms > 0:
                     QTimer.singleShot(rule.delay_ms, 
-                                     lambda: serial_connection.send_data(rule.response))
+                                     partial(serial_connection.send_data, rule.response))
                 else:
                     serial_connection.send_data(rule.response)
         
@@ -320,7 +335,7 @@ class ScriptEngine(QObject):
             if record['direction'] == 'TX':
                 delay_ms = int(record['elapsed_ms'] / speed)
                 QTimer.singleShot(delay_ms, 
-                                 lambda d=record['data']: serial_connection.send_data(d))
+                                 partial(serial_connection.send_data, record['data']))
     
     def get_all_rules(self) -> List[Dict[str, Any]]:
         """Lấy tất cả auto-response rules"""
@@ -95,6 +95,12 @@ class PortConfigDialog(QDialog):
         # Apply style
         self._apply_style()
     
+    def reset(self):
+        """Scan lại ports và đặt lại dialog theo config đã lưu trước khi mở lại"""
+        # Thiết bị có thể vừa được cắm/rút, luôn scan lại khi mở dialog
+        self._refresh_ports()
+        self._load_defaults()
+    
     def _refresh_ports(self):
         """Refresh danh sách ports"""
         self.port_combo.clear()
@@ -1,14 +1,21 @@
 """
 Display Windows Package
+Các display window được import khi dùng lần đầu (lazy)
 """
-from .base_display import BaseDisplayWindow, TextBasedDisplayWindow
-from .ascii_display import AsciiDisplayWindow
-from .hex_display import HexDisplayWindow
-from .binary_display import BinaryDisplayWindow
-from .decimal_display import DecimalDisplayWindow
-from .mixed_display import MixedDisplayWindow
-from .modbus_display import ModbusDisplayWindow
-from .custom_frame_display import CustomFrameDisplayWindow
+import importlib
+
+# Tên class -> module chứa class
+_LAZY_IMPORTS = {
+    'BaseDisplayWindow': '.base_display',
+    'TextBasedDisplayWindow': '.base_display',
+    'AsciiDisplayWindow': '.ascii_display',
+    'HexDisplayWindow': '.hex_display',
+    'BinaryDisplayWindow': '.binary_display',
+    'DecimalDisplayWindow': '.decimal_display',
+    'MixedDisplayWindow': '.mixed_display',
+    'ModbusDisplayWindow': '.modbus_display',
+    'CustomFrameDisplayWindow': '.custom_frame_display',
+}
 
 __all__ = [
     'BaseDisplayWindow',
@@ -21,3 +28,14 @@ __all__ = [
     'ModbusDisplayWindow',
     'CustomFrameDisplayWindow'
 ]
+
+
+def __getattr__(name):
+    """Import display window class khi được truy cập lần đầu"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -7,6 +7,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit,
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QFont, QTextCursor
 from datetime import datetime
+from collections import deque
 from typing import Optional, Dict
 from abc import ABCMeta, abstractmethod
 
@@ -21,6 +22,7 @@ class BaseDisplayWindow(QWidget, metaclass=QWidgetABCMeta):
     
     # Signals
     closed = pyqtSignal(str, str)  # port, display_mode
+    visibility_changed = pyqtSignal(bool)  # True khi show, False khi hide
     
     # Class variable để track các instances (singleton per port per mode)
     _instances: Dict[tuple, 'BaseDisplayWindow'] = {}
@@ -34,6 +36,13 @@ class BaseDisplayWindow(QWidget, metaclass=QWidgetABCMeta):
         self.max_lines = 10000
         self.paused = False
         
+        # QMdiSubWindow chứa window này (set bởi MainWindow)
+        self.sub_window = None
+        # Hàm hiển thị system message, None nếu window không hỗ trợ (set bởi MainWindow)
+        self.sysmsg_fn = None
+        # Data nhận được khi window bị minimize, hiển thị lại khi show
+        self._deferred_data = deque(maxlen=self.max_lines)
+        
         self._setup_ui()
         self._apply_style()
     
@@ -136,6 +145,25 @@ class BaseDisplayWindow(QWidget, metaclass=QWidgetABCMeta):
         """Xóa display (phải implement trong subclass)"""
         pass
     
+    def queue_data(self, data: bytes, timestamp: datetime, direction: str):
+        """Lưu data để hiển thị sau (khi window đang bị minimize)"""
+        self._deferred_data.append((data, timestamp, direction))
+    
+    def showEvent(self, event):
+        """Override showEvent để hiển thị data bị hoãn"""
+        super().showEvent(event)
+        if not event.spontaneous():
+            self.visibility_changed.emit(True)
+        while self._deferred_data:
+            self.display_data(*self._deferred_data.popleft())
+    
+    def hideEvent(self, event):
+        """Override hideEvent để báo window bị ẩn"""
+        super().hideEvent(event)
+        # Hide spontaneous (VD: minimize main window) không làm widget hidden
+        if not event.spontaneous():
+            self.visibility_changed.emit(False)
+    
     def _on_pause_clicked(self, checked: bool):
         """Xử lý nút pause"""
         self.paused = checked
@@ -1,93 +1,211 @@
 """
 Main Window Controller
 """
-from PyQt6.QtWidgets import (QMainWindow, QMessageBox, QFileDialog, QMdiArea,
-                             QMenuBar, QMenu, QToolBar, QStatusBar, QWidget, 
-                             QVBoxLayout, QDockWidget)
-from PyQt6.QtCore import pyqtSlot, Qt
+from PyQt6.QtWidgets import (QMainWindow, QMessageBox, QMdiArea, QMenu,
+                             QStatusBar, QWidget, QVBoxLayout, QDockWidget)
+from PyQt6.QtCore import pyqtSlot, Qt, QTimer, QSettings
 from PyQt6.QtGui import QAction
-import os
+from pathlib import Path
+from collections import deque, defaultdict
+from functools import partial
+from typing import Dict, List, Tuple
 
 from ..core.serial_manager import SerialPortManager, SerialConfig, SerialConnection
 from ..core.logger import SerialLogger, DataDirection
-from ..core.protocol_analyzer import create_sample_frame_definition
+from ..core.data_parser import TimestampFormatter
 from ..plugins.script_engine import ScriptEngine
 from ..plugins.export_manager import ExportManager
 from ..utils.config_manager import ConfigManager
-from .display_windows import (
-    AsciiDisplayWindow, HexDisplayWindow, BinaryDisplayWindow,
-    DecimalDisplayWindow, MixedDisplayWindow, ModbusDisplayWindow,
-    CustomFrameDisplayWindow
-)
-from .dialogs.port_config import PortConfigDialog
+from . import display_windows
 from .send_panel import SendPanel
 from datetime import datetime
+import logging
+
+
+log = logging.getLogger(__name__)
+
+# QSS theme directory, resolved once at import
+_THEME_DIR = (Path(__file__).parent / "../../resources/styles").resolve()
+
+# Interval for flushing queued log rows to the database
+_LOG_FLUSH_INTERVAL_MS = 100
+
+# Timestamp format for system messages
+_SYS_TS_FMT = "%H:%M:%S.%f"
+
+# System message colors by message type
+_SYS_MSG_COLORS = {
+    'info': '#3794ff',
+    'warning': '#ffcc00',
+    'error': '#f48771'
+}
+
+# Export file filters mapped to ExportManager methods
+_EXPORT_DISPATCH = {
+    "CSV (*.csv)": "export_to_csv",
+    "Text (*.txt)": "export_to_txt",
+    "HTML (*.html)": "export_to_html",
+    "JSON (*.json)": "export_to_json",
+}
+
+# Palette colors per theme: (QPalette.ColorRole name, RGB)
+_PALETTE_COLORS = {
+    "dark": (
+        ("Window", (30, 30, 30)),
+        ("WindowText", (212, 212, 212)),
+        ("Base", (37, 37, 38)),
+        ("AlternateBase", (45, 45, 48)),
+        ("Text", (212, 212, 212)),
+        ("Button", (45, 45, 48)),
+        ("ButtonText", (212, 212, 212)),
+        ("Highlight", (0, 122, 204)),
+        ("HighlightedText", (255, 255, 255)),
+    ),
+    "light": (
+        ("Window", (243, 243, 243)),
+        ("WindowText", (30, 30, 30)),
+        ("Base", (255, 255, 255)),
+        ("AlternateBase", (248, 248, 248)),
+        ("Text", (30, 30, 30)),
+        ("Button", (255, 255, 255)),
+        ("ButtonText", (30, 30, 30)),
+        ("Highlight", (0, 120, 212)),
+        ("HighlightedText", (255, 255, 255)),
+    ),
+}
+
+# QPalette per theme, built on first use
+_PALETTES = {}
+
+# Interval for coalescing RX chunks before display (~60 fps)
+_DISPLAY_FLUSH_INTERVAL_MS = 16
 
 
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # display_type -> (window class name, display mode)
+    # Classes are resolved lazily from the display_windows package
+    _DISPLAY_CLASSES = {
+        'ASCII': ('AsciiDisplayWindow', 'ASCII'),
+        'HEX': ('HexDisplayWindow', 'HEX'),
+        'Binary': ('BinaryDisplayWindow', 'Binary'),
+        'Decimal': ('DecimalDisplayWindow', 'Decimal'),
+        'Mixed': ('MixedDisplayWindow', 'Mixed (HEX+ASCII)'),
+        'Modbus': ('ModbusDisplayWindow', 'Modbus RTU'),
+    }
+    
+    # QSS file name -> stylesheet content, read once per process
+    _stylesheet_cache: Dict[str, str] = {}
+    
     def __init__(self):
         super().__init__()
         
-        print("Initializing MainWindow...")
+        log.debug("Initializing MainWindow...")
         
         try:
             # Setup UI
-            print("Setting up UI...")
+            log.debug("Setting up UI...")
             self._setup_ui()
-            print("UI setup complete")
+            log.debug("UI setup complete")
             
-            # Initialize managers
-            print("Initializing managers...")
+            # Only config is needed before first paint (theme)
             self.config_manager = ConfigManager()
-            print("ConfigManager OK")
-            
-            self.serial_manager = SerialPortManager()
-            print("SerialPortManager OK")
-            
-            self.logger = SerialLogger()
-            print("SerialLogger OK")
+            log.debug("ConfigManager OK")
             
-            self.script_engine = ScriptEngine()
-            print("ScriptEngine OK")
-            
-            self.export_manager = ExportManager()
-            print("ExportManager OK")
+            # Heavy managers are created in _post_paint_init
+            self.serial_manager: SerialPortManager = None
+            self.logger: SerialLogger = None
+            self.script_engine: ScriptEngine = None
+            self.export_manager: ExportManager = None
+            self._initialized = False
             
             # Current connection
             self.current_connection: SerialConnection = None
             self.current_port = None
             self.current_session_id = None
             
-            # Display windows
-            self.display_windows = {}
+            # Port config dialog, created on first use
+            self._port_config_dialog = None
+            
+            # Display windows per port; (port, display_mode) uniqueness is
+            # enforced by BaseDisplayWindow.get_instance
+            self._windows_by_port: Dict[str, List['BaseDisplayWindow']] = defaultdict(list)
+            # Windows currently shown, maintained from show/hide events
+            self._visible_windows: set = set()
             
-            # Setup
-            print("Connecting signals...")
-            self._connect_signals()
-            print("Signals connected")
+            # Write-behind log queue, flushed in one transaction per tick;
+            # the single-shot timer is armed only when rows are queued
+            self._log_queue = deque()
+            self._log_flush_timer = QTimer(self)
+            self._log_flush_timer.setSingleShot(True)
+            self._log_flush_timer.setInterval(_LOG_FLUSH_INTERVAL_MS)
+            self._log_flush_timer.timeout.connect(self._flush_log_queue)
             
-            print("Applying theme...")
+            # RX chunks waiting for display, drained by a single-shot timer
+            # Kept as separate (data, timestamp) chunks: frame-oriented
+            # displays (Modbus, Custom Frame) parse each call as one frame
+            self._pending_rx: List[Tuple[bytes, datetime]] = []
+            self._display_flush_timer = QTimer(self)
+            self._display_flush_timer.setSingleShot(True)
+            self._display_flush_timer.setInterval(_DISPLAY_FLUSH_INTERVAL_MS)
+            self._display_flush_timer.timeout.connect(self._flush_pending_rx)
+            
+            log.debug("Applying theme...")
+            self._current_theme = None
             saved_theme = self.config_manager.get("ui.theme", "dark")
             self._apply_theme(saved_theme)
-            print("Theme applied")
+            log.debug("Theme applied")
             
-            print("Updating UI state...")
+            log.debug("Updating UI state...")
+            # Last (is_connected, port_name) applied by _update_ui_state
+            self._last_ui_state = (None, None)
             self._update_ui_state()
-            print("UI state updated")
+            log.debug("UI state updated")
             
             # Load saved geometry
             self._load_window_geometry()
             
-            print("MainWindow initialization complete!")
+            # Finish initialization once the event loop has painted the window
+            QTimer.singleShot(0, self._post_paint_init)
             
-        except Exception as e:
-            print(f"Error in MainWindow.__init__: {e}")
-            import traceback
-            traceback.print_exc()
+            log.debug("MainWindow initialization complete!")
+            
+        except Exception:
+            log.exception("Error in MainWindow.__init__")
             raise
     
+    @pyqtSlot()
+    def _post_paint_init(self):
+        """Create managers not needed for the first frame"""
+        if self._initialized:
+            return
+        
+        log.debug("Initializing managers...")
+        self.serial_manager = SerialPortManager()
+        log.debug("SerialPortManager OK")
+        
+        self.logger = SerialLogger()
+        log.debug("SerialLogger OK")
+        
+        self.script_engine = ScriptEngine()
+        log.debug("ScriptEngine OK")
+        
+        self.export_manager = ExportManager()
+        log.debug("ExportManager OK")
+        
+        self._initialized = True
+        
+        # Long-lived widgets and managers exist now; keep them out of
+        # cyclic GC scans during steady-state traffic
+        import gc
+        gc.freeze()
+    
+    def _ensure_initialized(self):
+        """Run deferred initialization now if it has not run yet"""
+        if not self._initialized:
+            self._post_paint_init()
+    
     def _setup_ui(self):
         """Setup UI"""
         self.setWindowTitle("SerialView")
@@ -111,6 +229,8 @@ class MainWindow(QMainWindow):
         self.send_panel.set_connection_state(False)
         
         send_dock = QDockWidget("Send Panel", self)
+        # Needed by saveState()/restoreState() to persist the dock layout
+        send_dock.setObjectName("SendPanelDock")
         send_dock.setWidget(self.send_panel)
         send_dock.setAllowedAreas(Qt.DockWidgetArea.BottomDockWidgetArea | 
                                    Qt.DockWidgetArea.TopDockWidgetArea)
@@ -125,28 +245,67 @@ class MainWindow(QMainWindow):
         self.statusbar.showMessage("Ready")
     
     def _create_menus(self):
-        """Create menu bar"""
+        """Create menu bar; menu actions are built when a menu is first opened"""
         menubar = self.menuBar()
         
-        # File Menu
-        file_menu = menubar.addMenu("File")
+        # Actions used outside their menu, created by the menu builders
+        self.actionConnect = None
+        self.actionDisconnect = None
+        self.actionDarkTheme = None
+        self.actionLightTheme = None
+        
+        # Menu -> builder, removed once the menu is built
+        self._menu_builders = {}
+        for title, builder in (
+            ("File", self._populate_file_menu),
+            ("Port", self._populate_port_menu),
+            ("View", self._populate_view_menu),
+            ("Tools", self._populate_tools_menu),
+            ("Help", self._populate_help_menu),
+        ):
+            menu = menubar.addMenu(title)
+            self._menu_builders[menu] = builder
+            menu.aboutToShow.connect(self._on_menu_about_to_show)
+    
+    @pyqtSlot()
+    def _on_menu_about_to_show(self):
+        """Build menu contents the first time it is opened"""
+        menu = self.sender()
+        builder = self._menu_builders.pop(menu, None)
+        if builder is not None:
+            menu.aboutToShow.disconnect(self._on_menu_about_to_show)
+            builder(menu)
+    
+    def _populate_file_menu(self, file_menu: QMenu):
+        """Build File menu"""
         self.actionExit = QAction("Exit", self)
+        self.actionExit.triggered.connect(self.close)
         file_menu.addAction(self.actionExit)
-        
-        # Port Menu
-        port_menu = menubar.addMenu("Port")
+    
+    def _populate_port_menu(self, port_menu: QMenu):
+        """Build Port menu"""
         self.actionConnect = QAction("Connect", self)
         self.actionDisconnect = QAction("Disconnect", self)
         self.actionPortSettings = QAction("Port Settings...", self)
+        
+        self.actionConnect.triggered.connect(self._on_connect_disconnect_clicked)
+        self.actionDisconnect.triggered.connect(self._on_connect_disconnect_clicked)
+        self.actionPortSettings.triggered.connect(self._on_port_settings)
+        
+        # Sync with current connection state
+        is_connected = (self.current_connection is not None
+                        and self.current_connection.is_connected)
+        self.actionConnect.setEnabled(not is_connected)
+        self.actionDisconnect.setEnabled(is_connected)
+        
         port_menu.addAction(self.actionConnect)
         port_menu.addAction(self.actionDisconnect)
         port_menu.addSeparator()
         port_menu.addAction(self.actionPortSettings)
-        
-        # View Menu
-        view_menu = menubar.addMenu("View")
-        
-        # New Display submenu
+    
+    def _populate_view_menu(self, view_menu: QMenu):
+        """Build View menu"""
+        # New Display submenu (display type stored as action data)
         new_display_menu = view_menu.addMenu("New Display")
         self.actionDisplayASCII = QAction("ASCII", self)
         self.actionDisplayHEX = QAction("HEX", self)
@@ -156,6 +315,18 @@ class MainWindow(QMainWindow):
         self.actionDisplayModbus = QAction("Modbus RTU", self)
         self.actionDisplayCustomFrame = QAction("Custom Frame...", self)
         
+        for action, display_type in (
+            (self.actionDisplayASCII, 'ASCII'),
+            (self.actionDisplayHEX, 'HEX'),
+            (self.actionDisplayBinary, 'Binary'),
+            (self.actionDisplayDecimal, 'Decimal'),
+            (self.actionDisplayMixed, 'Mixed'),
+            (self.actionDisplayModbus, 'Modbus'),
+            (self.actionDisplayCustomFrame, 'CustomFrame'),
+        ):
+            action.setData(display_type)
+            action.triggered.connect(self._on_display_action)
+        
         new_display_menu.addAction(self.actionDisplayASCII)
         new_display_menu.addAction(self.actionDisplayHEX)
         new_display_menu.addAction(self.actionDisplayBinary)
@@ -165,9 +336,12 @@ class MainWindow(QMainWindow):
         new_display_menu.addAction(self.actionDisplayModbus)
         new_display_menu.addAction(self.actionDisplayCustomFrame)
         
+        # Window arrangement
         view_menu.addSeparator()
         self.actionCascade = QAction("Cascade", self)
         self.actionTile = QAction("Tile", self)
+        self.actionCascade.triggered.connect(self.mdiArea.cascadeSubWindows)
+        self.actionTile.triggered.connect(self.mdiArea.tileSubWindows)
         view_menu.addAction(self.actionCascade)
         view_menu.addAction(self.actionTile)
         
@@ -177,68 +351,57 @@ class MainWindow(QMainWindow):
         theme_menu = view_menu.addMenu("Theme")
         self.actionDarkTheme = QAction("Dark Theme", self)
         self.actionDarkTheme.setCheckable(True)
+        self.actionDarkTheme.setData("dark")
         self.actionLightTheme = QAction("Light Theme", self)
         self.actionLightTheme.setCheckable(True)
-        self.actionLightTheme.setChecked(True)
+        self.actionLightTheme.setData("light")
+        self.actionDarkTheme.triggered.connect(self._on_theme_action)
+        self.actionLightTheme.triggered.connect(self._on_theme_action)
+        
+        # Sync with current theme
+        is_light = self._current_theme == "light"
+        self.actionLightTheme.setChecked(is_light)
+        self.actionDarkTheme.setChecked(not is_light)
+        
         theme_menu.addAction(self.actionDarkTheme)
         theme_menu.addAction(self.actionLightTheme)
-        
-        # Tools Menu
-        tools_menu = menubar.addMenu("Tools")
+    
+    def _populate_tools_menu(self, tools_menu: QMenu):
+        """Build Tools menu"""
         self.actionScriptEditor = QAction("Script Editor", self)
         self.actionAutoResponse = QAction("Auto Response Rules", self)
         self.actionScheduledTasks = QAction("Scheduled Tasks", self)
         self.actionExportData = QAction("Export Data...", self)
         self.actionImportData = QAction("Import Data...", self)
         
+        self.actionScriptEditor.triggered.connect(self._on_script_editor)
+        self.actionAutoResponse.triggered.connect(self._on_auto_response)
+        self.actionScheduledTasks.triggered.connect(self._on_scheduled_tasks)
+        self.actionExportData.triggered.connect(self._on_export_data)
+        self.actionImportData.triggered.connect(self._on_import_data)
+        
         tools_menu.addAction(self.actionScriptEditor)
         tools_menu.addAction(self.actionAutoResponse)
         tools_menu.addAction(self.actionScheduledTasks)
         tools_menu.addSeparator()
         tools_menu.addAction(self.actionExportData)
         tools_menu.addAction(self.actionImportData)
-        
-        # Help Menu
-        help_menu = menubar.addMenu("Help")
+    
+    def _populate_help_menu(self, help_menu: QMenu):
+        """Build Help menu"""
         self.actionAbout = QAction("About", self)
+        self.actionAbout.triggered.connect(self._on_about)
         help_menu.addAction(self.actionAbout)
     
-    def _connect_signals(self):
-        """Connect signals"""
-        # Menu File
-        self.actionExit.triggered.connect(self.close)
-        
-        # Menu Port
-        self.actionConnect.triggered.connect(self._on_connect_disconnect_clicked)
-        self.actionDisconnect.triggered.connect(self._on_connect_disconnect_clicked)
-        self.actionPortSettings.triggered.connect(self._on_port_settings)
-        
-        # Menu View - New Display
-        self.actionDisplayASCII.triggered.connect(lambda: self._create_display('ASCII'))
-        self.actionDisplayHEX.triggered.connect(lambda: self._create_display('HEX'))
-        self.actionDisplayBinary.triggered.connect(lambda: self._create_display('Binary'))
-        self.actionDisplayDecimal.triggered.connect(lambda: self._create_display('Decimal'))
-        self.actionDisplayMixed.triggered.connect(lambda: self._create_display('Mixed'))
-        self.actionDisplayModbus.triggered.connect(lambda: self._create_display('Modbus'))
-        self.actionDisplayCustomFrame.triggered.connect(lambda: self._create_display('CustomFrame'))
-        
-        # Menu View - Window arrangement
-        self.actionCascade.triggered.connect(self.mdiArea.cascadeSubWindows)
-        self.actionTile.triggered.connect(self.mdiArea.tileSubWindows)
-        
-        # Menu View - Theme
-        self.actionDarkTheme.triggered.connect(lambda: self._apply_theme("dark"))
-        self.actionLightTheme.triggered.connect(lambda: self._apply_theme("light"))
-        
-        # Menu Tools
-        self.actionScriptEditor.triggered.connect(self._on_script_editor)
-        self.actionAutoResponse.triggered.connect(self._on_auto_response)
-        self.actionScheduledTasks.triggered.connect(self._on_scheduled_tasks)
-        self.actionExportData.triggered.connect(self._on_export_data)
-        self.actionImportData.triggered.connect(self._on_import_data)
-        
-        # Menu Help
-        self.actionAbout.triggered.connect(self._on_about)
+    @pyqtSlot()
+    def _on_display_action(self):
+        """Handle New Display menu actions"""
+        self._create_display(self.sender().data())
+    
+    @pyqtSlot()
+    def _on_theme_action(self):
+        """Handle Theme menu actions"""
+        self._apply_theme(self.sender().data())
     
     @pyqtSlot(bytes)
     def _on_send_panel_data(self, data: bytes):
@@ -256,32 +419,54 @@ class MainWindow(QMainWindow):
         else:
             self._connect()
     
+    def _get_port_config_dialog(self):
+        """Get port config dialog, creating it on first use"""
+        if self._port_config_dialog is None:
+            from .dialogs.port_config import PortConfigDialog
+            self._port_config_dialog = PortConfigDialog(self)
+        else:
+            self._port_config_dialog.reset()
+        return self._port_config_dialog
+    
     def _connect(self):
         """Connect to serial port"""
-        dialog = PortConfigDialog(self)
+        dialog = self._get_port_config_dialog()
         if dialog.exec():
             config = dialog.get_config()
             
-            self.current_connection = self.serial_manager.create_connection(config)
-            self.current_port = config.port
-            
-            self.current_connection.data_received.connect(self._on_data_received)
-            self.current_connection.data_sent.connect(self._on_data_sent)
-            self.current_connection.error_occurred.connect(self._on_error)
-            self.current_connection.connection_lost.connect(self._on_connection_lost)
-            
-            if self.current_connection.connect():
-                self.current_session_id = self.logger.start_session(
-                    config.port, config.baudrate, config.databits,
-                    config.parity, config.stopbits
-                )
-                
-                self.statusBar().showMessage(f"Connected to {config.port}")
-                self._update_ui_state()
+            if self._establish_connection(config):
+                self.statusbar.showMessage(f"Connected to {config.port}")
                 self._show_system_message(f"Connected to {config.port} at {config.baudrate} baud", "info")
             else:
                 QMessageBox.critical(self, "Error", "Failed to connect")
     
+    def _establish_connection(self, config: SerialConfig) -> bool:
+        """Create connection for config, wire signals and start logging session"""
+        self._ensure_initialized()
+        self._flush_pending_rx()
+        
+        self.current_connection = self.serial_manager.create_connection(config)
+        self.current_port = config.port
+        
+        self._wire_connection_signals(self.current_connection)
+        
+        if not self.current_connection.connect():
+            return False
+        
+        self.current_session_id = self.logger.start_session(
+            config.port, config.baudrate, config.databits,
+            config.parity, config.stopbits
+        )
+        self._update_ui_state()
+        return True
+    
+    def _wire_connection_signals(self, conn: SerialConnection):
+        """Connect serial connection signals to main window handlers"""
+        conn.data_received.connect(partial(self._on_data, DataDirection.RX))
+        conn.data_sent.connect(partial(self._on_data, DataDirection.TX))
+        conn.error_occurred.connect(self._on_error)
+        conn.connection_lost.connect(self._on_connection_lost)
+    
     def _disconnect(self):
         """Disconnect from port"""
         if not self.current_connection:
@@ -291,16 +476,17 @@ class MainWindow(QMainWindow):
         self.current_connection.disconnect()
         
         if self.current_session_id:
+            self._flush_log_queue()
             self.logger.end_session(self.current_session_id)
             self.current_session_id = None
         
-        self.statusBar().showMessage("Disconnected")
+        self.statusbar.showMessage("Disconnected")
         self._update_ui_state()
     
     @pyqtSlot()
     def _on_port_settings(self):
         """Open port settings dialog"""
-        dialog = PortConfigDialog(self)
+        dialog = self._get_port_config_dialog()
         if dialog.exec():
             config = dialog.get_config()
             
@@ -314,22 +500,8 @@ class MainWindow(QMainWindow):
                 if reply == QMessageBox.StandardButton.Yes:
                     self._disconnect()
                     
-                    self.current_connection = self.serial_manager.create_connection(config)
-                    self.current_port = config.port
-                    
-                    self.current_connection.data_received.connect(self._on_data_received)
-                    self.current_connection.data_sent.connect(self._on_data_sent)
-                    self.current_connection.error_occurred.connect(self._on_error)
-                    self.current_connection.connection_lost.connect(self._on_connection_lost)
-                    
-                    if self.current_connection.connect():
-                        self.current_session_id = self.logger.start_session(
-                            config.port, config.baudrate, config.databits,
-                            config.parity, config.stopbits
-                        )
-                        
-                        self.statusBar().showMessage(f"Reconnected to {config.port}")
-                        self._update_ui_state()
+                    if self._establish_connection(config):
+                        self.statusbar.showMessage(f"Reconnected to {config.port}")
                         self._show_system_message(f"Port reconnected with new settings: {config.baudrate} baud", "info")
                     else:
                         QMessageBox.critical(self, "Error", "Failed to reconnect")
@@ -340,23 +512,17 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please connect to a port first")
             return
         
-        window = None
-        
-        if display_type == 'ASCII':
-            window = AsciiDisplayWindow.get_instance(self.current_port, 'ASCII', self)
-        elif display_type == 'HEX':
-            window = HexDisplayWindow.get_instance(self.current_port, 'HEX', self)
-        elif display_type == 'Binary':
-            window = BinaryDisplayWindow.get_instance(self.current_port, 'Binary', self)
-        elif display_type == 'Decimal':
-            window = DecimalDisplayWindow.get_instance(self.current_port, 'Decimal', self)
-        elif display_type == 'Mixed':
-            window = MixedDisplayWindow.get_instance(self.current_port, 'Mixed (HEX+ASCII)', self)
-        elif display_type == 'Modbus':
-            window = ModbusDisplayWindow.get_instance(self.current_port, 'Modbus RTU', self)
-        elif display_type == 'CustomFrame':
+        if display_type == 'CustomFrame':
+            # Custom frame needs a frame definition
+            from ..core.protocol_analyzer import create_sample_frame_definition
+            from .display_windows import CustomFrameDisplayWindow
+            
             definition = create_sample_frame_definition()
             window = CustomFrameDisplayWindow.get_instance(self.current_port, f"Custom Frame: {definition.name}", definition, self)
+        else:
+            class_name, title = self._DISPLAY_CLASSES[display_type]
+            window_cls = getattr(display_windows, class_name)
+            window = window_cls.get_instance(self.current_port, title, self)
         
         if window is None:
             QMessageBox.information(self, "Info", 
@@ -364,101 +530,154 @@ class MainWindow(QMainWindow):
             return
         
         sub_window = self.mdiArea.addSubWindow(window)
+        window.sub_window = sub_window
+        window.sysmsg_fn = getattr(window, 'append_text', None)
         window.closed.connect(self._on_display_closed)
+        window.visibility_changed.connect(self._on_display_visibility_changed)
         window.show()
+        if not window.isHidden():
+            self._visible_windows.add(window)
         
-        key = (self.current_port, display_type)
-        self.display_windows[key] = window
+        self._windows_by_port[self.current_port].append(window)
+    
+    def _unregister_display(self, port: str, display_mode: str):
+        """Remove display window from the window registries"""
+        windows = self._windows_by_port.get(port, ())
+        for i, window in enumerate(windows):
+            if window.display_mode == display_mode:
+                del windows[i]
+                self._visible_windows.discard(window)
+                return
     
     @pyqtSlot(bytes, datetime)
     def _show_system_message(self, message: str, msg_type: str = "info"):
         """Display system message on all display windows"""
-        from ..core.data_parser import TimestampFormatter
-        
-        timestamp = datetime.now()
-        
-        color_map = {
-            'info': '#3794ff',
-            'warning': '#ffcc00',
-            'error': '#f48771'
-        }
-        color = color_map.get(msg_type, '#3794ff')
-        
-        for key, window in list(self.display_windows.items()):
-            if window.port == self.current_port:
-                try:
-                    if window.isVisible():
-                        if hasattr(window, 'append_text'):
-                            ts_str = TimestampFormatter.format_timestamp(timestamp, "%H:%M:%S.%f")
-                            formatted_msg = f"[{ts_str}] ⓘ SYSTEM: {message}"
-                            window.append_text(formatted_msg, color)
-                except RuntimeError:
-                    del self.display_windows[key]
-    
-    def _on_data_received(self, data: bytes, timestamp: datetime):
-        """Handle received data"""
-        if self.current_session_id:
-            self.logger.log_data(
-                self.current_port, DataDirection.RX, data,
-                session_id=self.current_session_id
-            )
-        
-        if self.current_connection:
-            self.script_engine.check_auto_response(data, self.current_connection)
+        # Keep message ordered after data already received
+        self._flush_pending_rx()
+        
+        color = _SYS_MSG_COLORS.get(msg_type, '#3794ff')
+        ts_str = TimestampFormatter.format_timestamp(datetime.now(), _SYS_TS_FMT)
+        formatted_msg = f"[{ts_str}] ⓘ SYSTEM: {message}"
+        
+        # Defer removal of dead windows until after iteration
+        visible = self._visible_windows
+        dead = None
+        for window in self._windows_by_port.get(self.current_port, ()):
+            fn = window.sysmsg_fn
+            if fn is None or window not in visible:
+                continue
+            try:
+                fn(formatted_msg, color)
+            except RuntimeError:
+                if dead is None:
+                    dead = []
+                dead.append(window)
+        
+        if dead:
+            for window in dead:
+                self._unregister_display(window.port, window.display_mode)
+    
+    def _on_data(self, direction: DataDirection, data: bytes, timestamp: datetime):
+        """Handle received (RX) or sent (TX) data"""
+        is_rx = direction is DataDirection.RX
         
-        self.script_engine.record_data('RX', data, timestamp)
+        if self.current_session_id:
+            if not self._log_queue:
+                self._log_flush_timer.start()
+            self._log_queue.append((
+                timestamp, self.current_port, direction, data,
+                None, self.current_session_id
+            ))
+        
+        if is_rx and self.current_connection:
+            # Matched after this callback returns, not inline with display
+            self.script_engine.queue_auto_response(data, self.current_connection)
+        
+        self.script_engine.record_data(direction.value, data, timestamp)
+        
+        if is_rx:
+            # Queue chunks; displayed together once per display flush tick
+            if not self._pending_rx:
+                self._display_flush_timer.start()
+            self._pending_rx.append((data, timestamp))
+        else:
+            # Show pending RX first to keep display order
+            self._flush_pending_rx()
+            self._dispatch_to_windows(((data, timestamp),), direction.value)
+    
+    @pyqtSlot()
+    def _flush_pending_rx(self):
+        """Display queued RX chunks"""
+        if not self._pending_rx:
+            return
         
-        windows_copy = list(self.display_windows.items())
-        for key, window in windows_copy:
-            if window.port == self.current_port:
-                try:
-                    if window and not window.isHidden():
-                        window.display_data(data, timestamp, 'RX')
-                except RuntimeError:
-                    if key in self.display_windows:
-                        del self.display_windows[key]
+        self._display_flush_timer.stop()
+        chunks = self._pending_rx
+        self._pending_rx = []
+        self._dispatch_to_windows(chunks, 'RX')
     
-    @pyqtSlot(bytes, datetime)
-    def _on_data_sent(self, data: bytes, timestamp: datetime):
-        """Handle sent data"""
-        if self.current_session_id:
-            self.logger.log_data(
-                self.current_port, DataDirection.TX, data,
-                session_id=self.current_session_id
-            )
-        
-        self.script_engine.record_data('TX', data, timestamp)
-        
-        windows_copy = list(self.display_windows.items())
-        for key, window in windows_copy:
-            if window.port == self.current_port:
-                try:
-                    if window and not window.isHidden():
-                        window.display_data(data, timestamp, 'TX')
-                except RuntimeError:
-                    if key in self.display_windows:
-                        del self.display_windows[key]
+    def _dispatch_to_windows(self, chunks, direction: str):
+        """Send (data, timestamp) chunks to all display windows of current port"""
+        windows = self._windows_by_port.get(self.current_port, ())
+        visible = self._visible_windows
+        
+        # Dead windows are rare; only allocate the list when one shows up
+        dead = None
+        for window in windows:
+            try:
+                if window in visible:
+                    for data, timestamp in chunks:
+                        window.display_data(data, timestamp, direction)
+                elif window.sub_window is not None and window.sub_window.isMinimized():
+                    for data, timestamp in chunks:
+                        window.queue_data(data, timestamp, direction)
+            except RuntimeError:
+                if dead is None:
+                    dead = []
+                dead.append(window)
+        
+        if dead:
+            for window in dead:
+                self._unregister_display(window.port, window.display_mode)
+    
+    @pyqtSlot()
+    def _flush_log_queue(self):
+        """Write queued log rows to the database"""
+        if not self._log_queue or self.logger is None:
+            return
+        
+        self._log_flush_timer.stop()
+        rows = list(self._log_queue)
+        self._log_queue.clear()
+        self.logger.log_data_bulk(rows)
     
     @pyqtSlot(str)
     def _on_error(self, error_msg: str):
         """Handle error"""
-        self.statusBar().showMessage(f"Error: {error_msg}")
+        self.statusbar.showMessage(f"Error: {error_msg}")
         self._show_system_message(f"Error: {error_msg}", "error")
         QMessageBox.critical(self, "Error", error_msg)
     
     @pyqtSlot()
     def _on_connection_lost(self):
         """Handle connection lost"""
-        self.statusBar().showMessage("Connection lost")
+        self.statusbar.showMessage("Connection lost")
         self._show_system_message("Connection lost - port disconnected", "error")
         self._update_ui_state()
     
+    @pyqtSlot(bool)
+    def _on_display_visibility_changed(self, visible: bool):
+        """Track which display windows are shown"""
+        window = self.sender()
+        if visible:
+            self._visible_windows.add(window)
+        else:
+            self._visible_windows.discard(window)
+    
     @pyqtSlot(str, str)
     def _on_display_closed(self, port: str, display_mode: str):
         """Handle display window closed"""
-        key = (port, display_mode)
-        if key in self.display_windows:
-            del self.display_windows[key]
+        self._unregister_display(port, display_mode)
     
     @pyqtSlot()
     def _on_script_editor(self):
@@ -482,24 +701,22 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No active connection")
             return
         
+        from PyQt6.QtWidgets import QFileDialog
+        
         filepath, filter_type = QFileDialog.getSaveFileName(
             self, "Export Data", "", 
-            "CSV (*.csv);;Text (*.txt);;HTML (*.html);;JSON (*.json)"
+            ";;".join(_EXPORT_DISPATCH)
         )
         
-        if not filepath:
+        method_name = _EXPORT_DISPATCH.get(filter_type)
+        if not filepath or method_name is None:
             return
         
+        self._ensure_initialized()
+        # Write pending rows so the export includes them
+        self._flush_log_queue()
         logs = self.logger.get_logs(port=self.current_port, limit=10000)
-        
-        if filter_type == "CSV (*.csv)":
-            self.export_manager.export_to_csv(logs, filepath)
-        elif filter_type == "Text (*.txt)":
-            self.export_manager.export_to_txt(logs, filepath)
-        elif filter_type == "HTML (*.html)":
-            self.export_manager.export_to_html(logs, filepath)
-        elif filter_type == "JSON (*.json)":
-            self.export_manager.export_to_json(logs, filepath)
+        getattr(self.export_manager, method_name)(logs, filepath)
         
         QMessageBox.information(self, "Success", "Data exported successfully")
     
@@ -524,89 +741,97 @@ class MainWindow(QMainWindow):
         if self.current_connection is not None:
             is_connected = self.current_connection.is_connected
         
-        self.actionConnect.setEnabled(not is_connected)
-        self.actionDisconnect.setEnabled(is_connected)
-        
         port_name = self.current_port if self.current_port else ""
+        
+        new_state = (is_connected, port_name)
+        if new_state == self._last_ui_state:
+            return
+        self._last_ui_state = new_state
+        
+        # Port menu actions exist once the menu has been opened
+        if self.actionConnect is not None:
+            self.actionConnect.setEnabled(not is_connected)
+            self.actionDisconnect.setEnabled(is_connected)
+        
         self.send_panel.set_connection_state(is_connected, port_name)
     
     def _apply_theme(self, theme: str = "dark"):
         """Apply theme"""
         try:
-            if theme == "light":
-                theme_file = "light_theme.qss"
-                self.actionLightTheme.setChecked(True)
-                self.actionDarkTheme.setChecked(False)
-                self._set_light_palette()
-            else:
-                theme_file = "dark_theme.qss"
-                self.actionDarkTheme.setChecked(True)
-                self.actionLightTheme.setChecked(False)
-                self._set_dark_palette()
+            is_light = theme == "light"
+            if self.actionLightTheme is not None:
+                self.actionLightTheme.setChecked(is_light)
+                self.actionDarkTheme.setChecked(not is_light)
+            
+            # Already applied (e.g. re-clicking the checked theme action)
+            if theme == self._current_theme:
+                return
+            
+            theme_file = "light_theme.qss" if is_light else "dark_theme.qss"
             
-            theme_path = os.path.join(os.path.dirname(__file__),
-                                     f"../../resources/styles/{theme_file}")
+            stylesheet = self._stylesheet_cache.get(theme_file)
+            if stylesheet is None:
+                theme_path = _THEME_DIR / theme_file
+                if theme_path.is_file():
+                    stylesheet = theme_path.read_text(encoding='utf-8')
+                    self._stylesheet_cache[theme_file] = stylesheet
             
-            if os.path.exists(theme_path):
-                with open(theme_path, 'r', encoding='utf-8') as f:
-                    stylesheet = f.read()
+            # Apply palette and stylesheet as one repaint
+            self.setUpdatesEnabled(False)
+            try:
+                self._set_palette("light" if is_light else "dark")
+                if stylesheet is not None:
                     self.setStyleSheet(stylesheet)
-                    
-                    self.config_manager.set("ui.theme", theme)
-                    self.config_manager.save()
+            finally:
+                self.setUpdatesEnabled(True)
+            
+            if stylesheet is not None:
+                self._current_theme = theme
+                
+                self.config_manager.set("ui.theme", theme)
+                self.config_manager.save()
         except Exception as e:
-            print(f"Error loading theme: {e}")
+            log.warning("Error loading theme: %s", e)
     
-    def _set_dark_palette(self):
-        """Set dark color palette"""
+    def _set_palette(self, palette_name: str):
+        """Set application color palette ('dark' or 'light')"""
         from PyQt6.QtGui import QPalette, QColor
         from PyQt6.QtWidgets import QApplication
         
-        palette = QPalette()
-        palette.setColor(QPalette.ColorRole.Window, QColor(30, 30, 30))
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(212, 212, 212))
-        palette.setColor(QPalette.ColorRole.Base, QColor(37, 37, 38))
-        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(45, 45, 48))
-        palette.setColor(QPalette.ColorRole.Text, QColor(212, 212, 212))
-        palette.setColor(QPalette.ColorRole.Button, QColor(45, 45, 48))
-        palette.setColor(QPalette.ColorRole.ButtonText, QColor(212, 212, 212))
-        palette.setColor(QPalette.ColorRole.Highlight, QColor(0, 122, 204))
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
-        QApplication.instance().setPalette(palette)
-    
-    def _set_light_palette(self):
-        """Set light color palette"""
-        from PyQt6.QtGui import QPalette, QColor
-        from PyQt6.QtWidgets import QApplication
+        palette = _PALETTES.get(palette_name)
+        if palette is None:
+            palette = QPalette()
+            for role, rgb in _PALETTE_COLORS[palette_name]:
+                palette.setColor(getattr(QPalette.ColorRole, role), QColor(*rgb))
+            _PALETTES[palette_name] = palette
         
-        palette = QPalette()
-        palette.setColor(QPalette.ColorRole.Window, QColor(243, 243, 243))
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(30, 30, 30))
-        palette.setColor(QPalette.ColorRole.Base, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(248, 248, 248))
-        palette.setColor(QPalette.ColorRole.Text, QColor(30, 30, 30))
-        palette.setColor(QPalette.ColorRole.Button, QColor(255, 255, 255))
-        palette.setColor(QPalette.ColorRole.ButtonText, QColor(30, 30, 30))
-        palette.setColor(QPalette.ColorRole.Highlight, QColor(0, 120, 212))
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
         QApplication.instance().setPalette(palette)
     
     def _load_window_geometry(self):
-        """Load window geometry from config"""
-        geometry = self.config_manager.get("ui.window_geometry")
-        if geometry:
-            pass
+        """Load window geometry from QSettings"""
+        settings = QSettings("SerialView", "SerialView")
+        geometry = settings.value("geom")
+        if geometry is not None:
+            self.restoreGeometry(geometry)
+        state = settings.value("state")
+        if state is not None:
+            self.restoreState(state)
     
     def _save_window_geometry(self):
-        """Save window geometry to config"""
-        pass
+        """Save window geometry to QSettings"""
+        settings = QSettings("SerialView", "SerialView")
+        settings.setValue("geom", self.saveGeometry())
+        settings.setValue("state", self.saveState())
     
     def closeEvent(self, event):
         """Override closeEvent"""
         if self.current_connection:
             self._disconnect()
         
+        self._log_flush_timer.stop()
+        self._flush_log_queue()
+        
+        # User preferences are saved by ConfigManager when changed
         self._save_window_geometry()
-        self.config_manager.save()
         
         event.accept()
\ No newline at end of file
@@ -8,6 +8,11 @@ from PyQt6.QtCore import pyqtSignal, Qt
 from ..core.data_parser import DataParser
 
 
+# Bảng tra token -> giá trị byte cho dạng thường gặp (0-255, binary 8 bit)
+_DEC_TOKENS = {str(i): i for i in range(256)}
+_BIN_TOKENS = {format(i, '08b'): i for i in range(256)}
+
+
 class SendPanel(QWidget):
     """Panel để gửi dữ liệu"""
     
@@ -20,6 +25,19 @@ class SendPanel(QWidget):
         
         self.periodic_timer = None
         self.is_connected = False
+        # True khi đang gửi theo chu kỳ, tránh tick chồng nhau
+        self._sending = False
+        # Payload đã parse, None khi input/format/line ending thay đổi
+        self._cached_payload = None
+        # Parser theo format và line ending hiện tại (cập nhật khi combo đổi)
+        self._parsers = {
+            "ASCII": self._parse_ascii,
+            "HEX": self._parse_hex,
+            "Decimal": self._parse_decimal,
+            "Binary": self._parse_binary,
+        }
+        self._parser = self._parse_ascii
+        self._line_ending = b''
         
         self._setup_ui()
         self._apply_style()
@@ -76,6 +94,7 @@ class SendPanel(QWidget):
         self.line_ending_combo.addItem("\\n", "\n")
         self.line_ending_combo.addItem("\\r", "\r")
         self.line_ending_combo.addItem("\\r\\n", "\r\n")
+        self.line_ending_combo.currentIndexChanged.connect(self._on_line_ending_changed)
         format_layout.addWidget(self.line_ending_combo)
         
         format_layout.addStretch()
@@ -85,6 +104,7 @@ class SendPanel(QWidget):
         self.input_text = QTextEdit()
         self.input_text.setMaximumHeight(50)
         self.input_text.setPlaceholderText("Enter data...")
+        self.input_text.textChanged.connect(self._invalidate_payload)
         input_layout.addWidget(self.input_text)
         
         # Format hint
@@ -144,6 +164,18 @@ class SendPanel(QWidget):
             "Binary": "Format: Enter binary bytes separated by space (e.g., 01000001 01000010)"
         }
         self.format_hint.setText(hints.get(format_text, ""))
+        self._parser = self._parsers.get(format_text, self._parse_none)
+        self._invalidate_payload()
+    
+    def _on_line_ending_changed(self, index: int):
+        """Thay đổi line ending"""
+        line_ending = self.line_ending_combo.itemData(index)
+        self._line_ending = line_ending.encode('utf-8') if line_ending else b''
+        self._invalidate_payload()
+    
+    def _invalidate_payload(self):
+        """Xóa payload đã parse, parse lại ở lần gửi sau"""
+        self._cached_payload = None
     
     def _on_connect_clicked(self, checked: bool):
         """Xử lý khi click nút Connect/Disconnect"""
@@ -168,50 +200,79 @@ class SendPanel(QWidget):
     
     def _on_send_clicked(self):
         """Gửi dữ liệu"""
-        text = self.input_text.toPlainText()
-        if not text:
-            self.status_label.setText("Error: No data to send")
-            return
-        
-        try:
-            data = self._parse_input(text)
-            if data:
-                self.send_data.emit(data)
-                self.status_label.setText(f"Sent: {len(data)} bytes")
-        except Exception as e:
-            self.status_label.setText(f"Error: {str(e)}")
+        data = self._cached_payload
+        if data is None:
+            text = self.input_text.toPlainText()
+            if not text:
+                self.status_label.setText("Error: No data to send")
+                return
+            
+            try:
+                data = self._parse_input(text)
+            except Exception as e:
+                self.status_label.setText(f"Error: {str(e)}")
+                return
+            self._cached_payload = data
+        
+        if data:
+            self.send_data.emit(data)
+            self.status_label.setText(f"Sent: {len(data)} bytes")
     
     def _parse_input(self, text: str) -> bytes:
         """Parse input text theo format"""
-        format_type = self.format_combo.currentText()
-        
-        # Get line ending
-        line_ending = self.line_ending_combo.currentData()
-        if line_ending:
-            text = text + line_ending
-        
-        if format_type == "ASCII":
-            return text.encode('utf-8')
-        
-        elif format_type == "HEX":
-            # Remove spaces and convert
+        return self._parser(text)
+    
+    def _parse_ascii(self, text: str) -> bytes:
+        """Parse ASCII text, thêm line ending vào cuối"""
+        # Các format khác bỏ qua line ending (bị coi là whitespace)
+        return text.encode('utf-8') + self._line_ending
+    
+    def _parse_hex(self, text: str) -> bytes:
+        """Parse hex bytes"""
+        # bytes.fromhex nhận cả "010203" và "01 02 03" (whitespace giữa các cặp)
+        try:
+            return bytes.fromhex(text)
+        except ValueError:
+            # "0x01", số chữ số lẻ... để DataParser xử lý
             hex_str = text.replace(" ", "").replace("\n", "").replace("\r", "")
             return DataParser.hex_string_to_bytes(hex_str)
-        
-        elif format_type == "Decimal":
-            # Parse decimal numbers
-            numbers = text.replace("\n", " ").replace("\r", " ").split()
-            byte_list = [int(n) & 0xFF for n in numbers if n.strip()]
-            return bytes(byte_list)
-        
-        elif format_type == "Binary":
-            # Parse binary numbers
-            numbers = text.replace("\n", " ").replace("\r", " ").split()
-            byte_list = [int(n, 2) & 0xFF for n in numbers if n.strip()]
-            return bytes(byte_list)
-        
+    
+    def _parse_decimal(self, text: str) -> bytes:
+        """Parse decimal numbers"""
+        # split() tách theo mọi whitespace (space, tab, \r, \n)
+        numbers = text.split()
+        try:
+            return bytes(map(_DEC_TOKENS.__getitem__, numbers))
+        except KeyError:
+            # Có số ngoài 0-255 hoặc viết khác (VD: "007"), parse từng số
+            return bytes([int(n) & 0xFF for n in numbers])
+    
+    def _parse_binary(self, text: str) -> bytes:
+        """Parse binary numbers"""
+        # split() tách theo mọi whitespace (space, tab, \r, \n)
+        numbers = text.split()
+        try:
+            return bytes(map(_BIN_TOKENS.__getitem__, numbers))
+        except KeyError:
+            # Có số không đủ 8 bit, parse từng số
+            return bytes([int(n, 2) & 0xFF for n in numbers])
+    
+    def _parse_none(self, text: str) -> bytes:
+        """Format không hỗ trợ"""
         return b''
     
+    def _on_periodic_timeout(self):
+        """Gửi theo chu kỳ, bỏ qua tick nếu lần gửi trước chưa xong"""
+        # Handler của send_data có thể chạy nested event loop (VD: QMessageBox)
+        if self._sending:
+            return
+        
+        self._sending = True
+        try:
+            self._on_send_clicked()
+        finally:
+            self._sending = False
+    
     def _on_periodic_toggled(self, state: int):
         """Toggle periodic send"""
         from PyQt6.QtCore import QTimer, Qt
@@ -220,9 +281,14 @@ class SendPanel(QWidget):
             # Start periodic send
             if self.periodic_timer is None:
                 self.periodic_timer = QTimer(self)
-                self.periodic_timer.timeout.connect(self._on_send_clicked)
+                self.periodic_timer.timeout.connect(self._on_periodic_timeout)
             
             interval = self.interval_spin.value()
+            # Interval dài không cần độ chính xác ms, cho phép gộp wakeup
+            if interval >= 20:
+                self.periodic_timer.setTimerType(Qt.TimerType.CoarseTimer)
+            else:
+                self.periodic_timer.setTimerType(Qt.TimerType.PreciseTimer)
             self.periodic_timer.start(interval)
             self.status_label.setText(f"Periodic send: every {interval}ms")
             
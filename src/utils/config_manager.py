@@ -2,14 +2,23 @@
 Config Manager - Singleton pattern
 Quản lý tất cả cấu hình của ứng dụng
 """
+import copy
 import json
 import os
+from functools import lru_cache
 from typing import Any, Dict
 
 
+# Đánh dấu key không tồn tại trong cache của get()
+_MISSING = object()
+
+
 class ConfigManager:
     """Singleton class quản lý cấu hình"""
     
+    __slots__ = ("_initialized", "config_dir", "default_config_path",
+                 "user_config_path", "config", "_get_cached", "_saved_config")
+    
     _instance = None
     
     def __new__(cls):
@@ -27,6 +36,12 @@ class ConfigManager:
         self.default_config_path = os.path.join(self.config_dir, "default_config.json")
         self.user_config_path = os.path.join(self.config_dir, "user_config.json")
         
+        # Cache kết quả tra key path, xóa khi config thay đổi
+        self._get_cached = lru_cache(maxsize=256)(self._lookup)
+        
+        # Bản sao config lần cuối ghi ra user config file
+        self._saved_config = None
+        
         self._ensure_config_dir()
         self.config = self._load_config()
     
@@ -58,7 +73,6 @@ class ConfigManager:
                 "theme": "light",
                 "font_family": "Consolas",
                 "font_size": 10,
-                "window_geometry": None,
                 "mdi_mode": True
             },
             "display": {
@@ -93,46 +107,54 @@ class ConfigManager:
             try:
                 user_config = self._load_json(self.user_config_path)
                 # Merge với default config
-                return self._merge_configs(default_config, user_config)
+                self._merge_into(default_config, user_config)
+                # File đã khớp config này, save() không cần ghi lại
+                self._saved_config = copy.deepcopy(default_config)
+                return default_config
             except Exception as e:
                 print(f"Error loading user config: {e}")
-                return default_config
+                # default_config có thể đã bị merge một phần
+                return self._get_default_config()
         
         return default_config
     
     def _load_json(self, path: str) -> Dict[str, Any]:
         """Load JSON file"""
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(path, 'rb') as f:
+            return json.loads(f.read())
     
     def _save_json(self, path: str, data: Dict[str, Any]):
         """Save JSON file"""
+        # Serialize trước rồi ghi một lần thay vì nhiều lần write nhỏ
+        text = json.dumps(data, indent=4, ensure_ascii=False)
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.write(text)
     
-    def _merge_configs(self, default: Dict, user: Dict) -> Dict:
-        """Merge user config vào default config"""
-        result = default.copy()
-        for key, value in user.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_configs(result[key], value)
+    def _merge_into(self, dst: Dict, src: Dict):
+        """Merge src vào dst (in-place)"""
+        for key, value in src.items():
+            if isinstance(value, dict) and isinstance(dst.get(key), dict):
+                self._merge_into(dst[key], value)
             else:
-                result[key] = value
-        return result
+                dst[key] = value
     
     def get(self, key_path: str, default: Any = None) -> Any:
         """
         Lấy giá trị config theo key path
         VD: get("serial.default_baudrate")
         """
-        keys = key_path.split('.')
+        value = self._get_cached(key_path)
+        return default if value is _MISSING else value
+    
+    def _lookup(self, key_path: str) -> Any:
+        """Tra giá trị theo key path, trả về _MISSING nếu không có"""
         value = self.config
         
-        for key in keys:
+        for key in key_path.split('.'):
             if isinstance(value, dict) and key in value:
                 value = value[key]
             else:
-                return default
+                return _MISSING
         
         return value
     
@@ -150,11 +172,17 @@ class ConfigManager:
             config = config[key]
         
         config[keys[-1]] = value
+        self._get_cached.cache_clear()
     
     def save(self):
         """Lưu config hiện tại vào user config file"""
+        # Không ghi lại file nếu config không đổi từ lần save trước
+        if self.config == self._saved_config:
+            return True
+        
         try:
             self._save_json(self.user_config_path, self.config)
+            self._saved_config = copy.deepcopy(self.config)
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
@@ -163,5 +191,7 @@ class ConfigManager:
     def reset_to_default(self):
         """Reset về cấu hình mặc định"""
         self.config = self._get_default_config()
+        self._get_cached.cache_clear()
+        self._saved_config = None
         if os.path.exists(self.user_config_path):
             os.remove(self.user_config_path)
@@ -3,10 +3,21 @@ Helper functions - Các hàm tiện ích dùng chung
 """
 import os
 import json
-from typing import Any, List, Dict
+from collections import deque
+from typing import Any, List, Dict, Tuple
 from datetime import datetime
 
 
+# Bảng translate cho cột ASCII của hex dump: ký tự không in được -> '.'
+_ASCII_TBL = bytes(i if 32 <= i <= 126 else 0x2e for i in range(256))
+
+# Đơn vị cho format_bytes_size theo lũy thừa của 1024
+_SIZE_UNITS = ((1, "B"), (1024, "KB"), (1024 ** 2, "MB"), (1024 ** 3, "GB"))
+
+# Bảng translate cho sanitize_filename: ký tự không hợp lệ -> '_'
+_SANITIZE_TBL = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+
 def ensure_dir(directory: str):
     """Đảm bảo thư mục tồn tại"""
     if not os.path.exists(directory):
@@ -16,26 +27,25 @@ def ensure_dir(directory: str):
 def save_json(filepath: str, data: Dict[str, Any]):
     """Lưu dữ liệu vào JSON file"""
     ensure_dir(os.path.dirname(filepath))
+    text = json.dumps(data, indent=4, ensure_ascii=False)
     with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.write(text)
 
 
 def load_json(filepath: str) -> Dict[str, Any]:
     """Load dữ liệu từ JSON file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(filepath, 'rb') as f:
+        return json.loads(f.read())
 
 
 def format_bytes_size(size_bytes: int) -> str:
     """Format kích thước file theo KB, MB, GB"""
-    if size_bytes < 1024:
+    # Mỗi đơn vị cách nhau 10 bit
+    idx = min(3, max(0, (max(int(size_bytes), 0).bit_length() - 1) // 10))
+    if idx == 0:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.2f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    divisor, unit = _SIZE_UNITS[idx]
+    return f"{size_bytes / divisor:.2f} {unit}"
 
 
 def get_timestamp_string(fmt: str = "%Y%m%d_%H%M%S") -> str:
@@ -45,10 +55,7 @@ def get_timestamp_string(fmt: str = "%Y%m%d_%H%M%S") -> str:
 
 def sanitize_filename(filename: str) -> str:
     """Làm sạch filename, loại bỏ ký tự không hợp lệ"""
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    return filename
+    return filename.translate(_SANITIZE_TBL)
 
 
 def chunk_list(lst: List, chunk_size: int) -> List[List]:
@@ -56,23 +63,35 @@ def chunk_list(lst: List, chunk_size: int) -> List[List]:
     return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
 
 
+def chunk_bytes(data: bytes, chunk_size: int) -> List[memoryview]:
+    """Chia bytes thành các chunk memoryview (không copy dữ liệu)"""
+    mv = memoryview(data)
+    return [mv[i:i + chunk_size] for i in range(0, len(mv), chunk_size)]
+
+
 def bytes_to_hex_dump(data: bytes, bytes_per_line: int = 16) -> str:
     """Tạo hex dump string giống hexdump command"""
-    lines = []
-    for i in range(0, len(data), bytes_per_line):
+    data = bytes(data)
+    n_lines = (len(data) + bytes_per_line - 1) // bytes_per_line
+    hex_width = bytes_per_line * 3 - 1
+    
+    # Cấp phát list đủ số dòng một lần, join một lần ở cuối
+    lines = [None] * n_lines
+    for idx in range(n_lines):
+        i = idx * bytes_per_line
         chunk = data[i:i + bytes_per_line]
         
         # Offset
         offset = f"{i:08x}"
         
-        # Hex bytes
-        hex_part = ' '.join(f"{b:02x}" for b in chunk)
-        hex_part = hex_part.ljust(bytes_per_line * 3 - 1)
+        # Hex bytes (bytes.hex chạy trong C, không format từng byte)
+        hex_part = chunk.hex(' ')
+        hex_part = hex_part.ljust(hex_width)
         
         # ASCII part
-        ascii_part = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
+        ascii_part = chunk.translate(_ASCII_TBL).decode('latin-1')
         
-        lines.append(f"{offset}  {hex_part}  |{ascii_part}|")
+        lines[idx] = f"{offset}  {hex_part}  |{ascii_part}|"
     
     return '\n'.join(lines)
 
@@ -80,23 +99,30 @@ def bytes_to_hex_dump(data: bytes, bytes_per_line: int = 16) -> str:
 class RingBuffer:
     """Ring buffer cho lưu data với kích thước cố định"""
     
+    __slots__ = ("max_size", "buffer", "_snapshot")
+    
     def __init__(self, max_size: int):
         self.max_size = max_size
-        self.buffer = []
+        # deque tự bỏ item cũ nhất khi đầy, append O(1)
+        self.buffer = deque(maxlen=max_size)
+        # Snapshot của get_all, None khi buffer đã thay đổi
+        self._snapshot = None
     
     def append(self, item: Any):
         """Thêm item vào buffer"""
         self.buffer.append(item)
-        if len(self.buffer) > self.max_size:
-            self.buffer.pop(0)
+        self._snapshot = None
     
-    def get_all(self) -> List[Any]:
-        """Lấy tất cả items"""
-        return self.buffer.copy()
+    def get_all(self) -> Tuple[Any, ...]:
+        """Lấy tất cả items (tuple, dùng lại nếu buffer chưa thay đổi)"""
+        if self._snapshot is None:
+            self._snapshot = tuple(self.buffer)
+        return self._snapshot
     
     def clear(self):
         """Xóa buffer"""
         self.buffer.clear()
+        self._snapshot = None
     
     def __len__(self):
         return len(self.buffer)